@@ -4,10 +4,17 @@ Atomo - A nano clone text editor in Python
 Usage: python atomo.py [filename]
 """
 
+import bisect
+import codecs
 import curses
+import mmap
 import sys
 import os
-from typing import List, Optional, Tuple
+import time
+import unicodedata
+from collections import OrderedDict
+from itertools import accumulate, chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 # Key code constants
 CTRL_X = 24
@@ -19,9 +26,378 @@ CTRL_G = 7
 CTRL_A = 1
 CTRL_E = 5
 CTRL_Z = 26
+CTRL_C = 3
+TAB = 9
+ESC = 27
+
+# Key codes inserted as typed text without further checks
+PRINTABLE_KEYS = frozenset(range(32, 127))
+
+# Keys that end a line, delete backwards, or cancel a prompt
+ENTER_KEYS = frozenset((curses.KEY_ENTER, 10, 13))
+BACKSPACE_KEYS = frozenset((curses.KEY_BACKSPACE, 127, 8))
+CANCEL_KEYS = frozenset((ESC, CTRL_C))
+
+# How long a lone Esc waits to be told apart from an escape sequence (ms); ncurses defaults to 1000
+ESC_DELAY = 25
+
+# How long to wait for the rest of a UTF-8 sequence once its first byte arrived (ms)
+UTF8_TIMEOUT = 50
+
+# Keys that open a prompt: they are always handled after a fresh draw
+MODAL_KEYS = (CTRL_X, CTRL_O, CTRL_W, CTRL_G)
 
 MAX_UNDO = 200
 
+IO_BUFFER_SIZE = 1 << 16
+
+# Files larger than this are loaded through mmap, decoded this many bytes at a time
+MMAP_THRESHOLD = 1 << 20
+
+# Longest stretch of queued input handled before the screen is redrawn (seconds)
+FRAME_BUDGET = 1 / 30
+
+# Shortest time between two frames while keys keep arriving (seconds): caps redraws at 60 Hz
+FRAME_INTERVAL = 1 / 60
+
+# A screen cell as composed in the frame: (character, curses attribute)
+BLANK_CELL = (" ", 0)
+
+# Columns between tab stops, as curses expands them
+TAB_SIZE = 8
+
+# Buffer line cells are cached from column 0 up to this column; further right
+# only the visible part of a line is composed
+ROW_CACHE_COLUMNS = 1024
+
+# Screen regions outside the text area; draw() recomposes a region only when
+# its bit is set (the text area tracks dirty lines itself, see mark_dirty)
+REGION_TITLE = 1
+REGION_MESSAGE = 2
+REGION_STATUS = 4
+REGION_HELP = 8
+REGION_ALL = REGION_TITLE | REGION_MESSAGE | REGION_STATUS | REGION_HELP
+
+# Synchronized output (DEC private mode 2026): the terminal holds a frame sent
+# between these and paints it at once; terminals without support ignore them
+BEGIN_SYNC_UPDATE = b"\x1b[?2026h"
+END_SYNC_UPDATE = b"\x1b[?2026l"
+
+TITLE = "  GNU nano clone - Atomo"
+
+HELP_SHORTCUTS = (
+    ("^X", "Exit"), ("^O", "Save"), ("^W", "Search"),
+    ("^K", "Cut"), ("^U", "Paste"), ("^Z", "Undo"), ("^G", "Help"),
+)
+
+
+class GapBuffer:
+    """A line kept as two stacks around the edit point, so edits there are O(1) amortized"""
+
+    __slots__ = ("_left", "_right")
+
+    def __init__(self, text: str = ""):
+        self._left: List[str] = list(text)  # characters before the gap
+        self._right: List[str] = []         # characters after the gap, in reverse order
+
+    def __len__(self) -> int:
+        return len(self._left) + len(self._right)
+
+    def __str__(self) -> str:
+        return ''.join(self._left) + ''.join(reversed(self._right))
+
+    def __getitem__(self, key: slice) -> str:
+        """Slice like a str, copying only the requested characters"""
+        start, stop, _ = key.indices(len(self))
+        left, right = self._left, self._right
+        n_left = len(left)
+
+        text = ''.join(left[start:min(stop, n_left)])
+        if stop > n_left:
+            hi = len(right) - max(start - n_left, 0)
+            lo = len(right) - (stop - n_left)
+            text += ''.join(reversed(right[lo:hi]))
+        return text
+
+    def move_gap(self, pos: int):
+        """Move the gap to column pos, shifting only the characters in between"""
+        n_left = len(self._left)
+        if pos < n_left:
+            moved = self._left[pos:]
+            del self._left[pos:]
+            moved.reverse()
+            self._right.extend(moved)
+        elif pos > n_left:
+            count = pos - n_left
+            moved = self._right[-count:]
+            del self._right[-count:]
+            moved.reverse()
+            self._left.extend(moved)
+
+    def insert(self, text: str):
+        """Insert text before the gap"""
+        self._left.extend(text)
+
+    def delete_left(self, count: int = 1) -> str:
+        """Remove up to count characters before the gap and return them"""
+        if count <= 0:
+            return ""
+        removed = ''.join(self._left[-count:])
+        del self._left[-count:]
+        return removed
+
+    def delete_right(self, count: int = 1) -> str:
+        """Remove up to count characters after the gap and return them"""
+        if count <= 0:
+            return ""
+        removed = ''.join(reversed(self._right[-count:]))
+        del self._right[-count:]
+        return removed
+
+
+class LineRope:
+    """Sequence of lines stored in chunks, so insert/pop only shift one chunk.
+
+    copy() shares the chunks with the copy; a chunk is duplicated the first
+    time either side writes to it, which keeps undo snapshots cheap.
+    """
+
+    CHUNK_SIZE = 1024
+
+    __slots__ = ("_chunks", "_owned", "_starts", "_len", "version")
+
+    def __init__(self, lines: Iterable = ()):
+        lines = list(lines)
+        size = self.CHUNK_SIZE
+        self._chunks: List[list] = [lines[i:i + size] for i in range(0, len(lines), size)] or [[]]
+        self._owned: List[bool] = [True] * len(self._chunks)
+        self._starts: Optional[List[int]] = None  # index of each chunk's first line, built lazily
+        self._len = len(lines)
+        self.version = 0  # bumped on every store, insert and pop
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._chunks)
+
+    def blocks(self) -> Iterator[list]:
+        """The lines chunk by chunk; the lists are shared and must not be modified"""
+        return (chunk for chunk in self._chunks if chunk)
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("line index out of range")
+        return i
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        """Map a line index to (chunk number, offset within the chunk)"""
+        if self._starts is None:
+            self._starts = list(accumulate(map(len, self._chunks), initial=0))
+        k = min(bisect.bisect_right(self._starts, i) - 1, len(self._chunks) - 1)
+        return k, i - self._starts[k]
+
+    def _writable(self, k: int) -> list:
+        """Return chunk k, copying it first if it is still shared with a copy()"""
+        if not self._owned[k]:
+            self._chunks[k] = self._chunks[k][:]
+            self._owned[k] = True
+        return self._chunks[k]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return list(self)[key]
+            result: list = []
+            if start >= stop:
+                return result
+            k, off = self._locate(start)
+            while len(result) < stop - start:
+                chunk = self._chunks[k]
+                result.extend(chunk[off:off + stop - start - len(result)])
+                k, off = k + 1, 0
+            return result
+
+        if len(self._chunks) == 1:
+            return self._chunks[0][key]
+        k, off = self._locate(self._index(key))
+        return self._chunks[k][off]
+
+    def __setitem__(self, i: int, line):
+        k, off = self._locate(self._index(i))
+        self._writable(k)[off] = line
+        self.version += 1
+
+    def insert(self, i: int, line):
+        """Insert before index i, with list.insert semantics"""
+        if i < 0:
+            i = max(0, i + self._len)
+        i = min(i, self._len)
+        k, off = self._locate(i)
+        chunk = self._writable(k)
+        chunk.insert(off, line)
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            half = len(chunk) // 2
+            self._chunks[k:k + 1] = [chunk[:half], chunk[half:]]
+            self._owned[k:k + 1] = [True, True]
+        self._len += 1
+        self._starts = None
+        self.version += 1
+
+    def insert_lines(self, i: int, lines: list):
+        """Insert several lines before index i with one splice into a chunk"""
+        if not lines:
+            return
+        i = min(max(0, i + self._len if i < 0 else i), self._len)
+        k, off = self._locate(i)
+        chunk = self._writable(k)
+        chunk[off:off] = lines
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            size = self.CHUNK_SIZE
+            pieces = [chunk[j:j + size] for j in range(0, len(chunk), size)]
+            self._chunks[k:k + 1] = pieces
+            self._owned[k:k + 1] = [True] * len(pieces)
+        self._len += len(lines)
+        self._starts = None
+        self.version += 1
+
+    def pop(self, i: int = -1):
+        """Remove and return the line at index i"""
+        k, off = self._locate(self._index(i))
+        chunk = self._writable(k)
+        line = chunk.pop(off)
+        if not chunk and len(self._chunks) > 1:
+            del self._chunks[k]
+            del self._owned[k]
+        self._len -= 1
+        self._starts = None
+        self.version += 1
+        return line
+
+    def copy(self) -> "LineRope":
+        """O(number of chunks) copy; chunks are shared until one side writes"""
+        clone = LineRope.__new__(LineRope)
+        clone._chunks = list(self._chunks)
+        clone._owned = [False] * len(self._chunks)
+        clone._starts = self._starts
+        clone._len = self._len
+        clone.version = self.version
+        self._owned = [False] * len(self._chunks)
+        return clone
+
+
+# Undo entries: (lines, cursor_y, cursor_x, None) snapshots before structural
+# changes, or (None, cursor_y, cursor_x, (y, x, removed, inserted)) for edits
+# that stay within one line and are undone by splicing `removed` back at (y, x)
+UndoEntry = Tuple[Optional[LineRope], int, int, Optional[Tuple[int, int, str, int]]]
+
+
+class CellTable(dict):
+    """Frame cells for one attribute, keyed by character; each (char, attr) tuple is built once"""
+
+    __slots__ = ("attr",)
+
+    def __init__(self, attr: int):
+        super().__init__()
+        self.attr = attr
+
+    def __missing__(self, char: str) -> Tuple[str, int]:
+        cell = self[char] = (char, self.attr)
+        return cell
+
+
+def single_cell_text(text: str) -> bool:
+    """True if every character of text takes exactly one screen cell"""
+    if not text.isprintable():
+        return False
+    return text.isascii() or not any(
+        unicodedata.category(ch) in ("Mn", "Me") or unicodedata.east_asian_width(ch) in "WF"
+        for ch in text if not ch.isascii())
+
+
+def display_cells(text: str) -> List[str]:
+    """Split text into the screen cells it occupies, one string per cell.
+
+    Tabs expand to the next TAB_SIZE stop, control characters show as ^X, wide
+    glyphs are followed by an empty filler cell and zero-width marks join the
+    cell before them, so the frame matches the screen column by column.
+    """
+    cells: List[str] = []
+    for ch in text:
+        if ch == '\t':
+            cells.extend(' ' * (TAB_SIZE - len(cells) % TAB_SIZE))
+        elif ch < ' ' or ch == '\x7f':
+            cells.extend(('^', chr(ord(ch) ^ 0x40)))
+        elif ch.isascii():
+            cells.append(ch)
+        else:
+            category = unicodedata.category(ch)
+            if category in ("Mn", "Me", "Cf"):
+                if cells:
+                    cells[-1] += ch
+            elif category in ("Cc", "Cn", "Cs"):
+                cells.append('?')
+            elif unicodedata.east_asian_width(ch) in "WF":
+                cells.extend((ch, ''))
+            else:
+                cells.append(ch)
+    return cells
+
+
+def io_buffer_size(path: str) -> int:
+    """IO_BUFFER_SIZE rounded up to whole blocks of the filesystem holding path"""
+    try:
+        target = path if os.path.exists(path) else os.path.dirname(os.path.abspath(path))
+        block = os.stat(target).st_blksize
+    except (OSError, AttributeError):  # st_blksize does not exist on Windows
+        return IO_BUFFER_SIZE
+    if block <= 0:
+        return IO_BUFFER_SIZE
+    return -(-IO_BUFFER_SIZE // block) * block
+
+
+def split_lines(blocks: Iterable[bytes]) -> List[str]:
+    """Decode consecutive UTF-8 blocks of a file and split them into lines.
+
+    Newlines are translated like text-mode open(): \r\n and lone \r end a line too.
+    """
+    result: List[str] = []
+    decode = codecs.getincrementaldecoder('utf-8')().decode
+    tail = ""
+    for block in blocks:
+        text = tail + decode(block)
+        carry = ""
+        if text.endswith('\r'):  # may be the first half of a \r\n split across blocks
+            text, carry = text[:-1], '\r'
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        tail = lines.pop() + carry
+        result.extend(lines)
+
+    tail += decode(b'', final=True)
+    if tail:
+        lines = tail.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        if not lines[-1]:
+            lines.pop()
+        result.extend(lines)
+    return result
+
+
+def read_lines(filename: str) -> List[str]:
+    """Read the lines of a UTF-8 file as bytes, through mmap above MMAP_THRESHOLD"""
+    if os.path.getsize(filename) > MMAP_THRESHOLD:
+        with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return split_lines(mm[start:start + MMAP_THRESHOLD]
+                               for start in range(0, len(mm), MMAP_THRESHOLD))
+
+    size = io_buffer_size(filename)
+    with open(filename, 'rb', buffering=0) as f:
+        return split_lines(iter(lambda: f.read(size), b''))
+
 
 class AtomoEditor:
     """Main editor class that handles the text editing interface"""
@@ -29,7 +405,7 @@ class AtomoEditor:
     def __init__(self, stdscr, filename: Optional[str] = None):
         self.stdscr = stdscr
         self.filename = filename
-        self.lines: List[str] = []
+        self.lines = LineRope()
         self.cursor_y = 0
         self.cursor_x = 0
         self.offset_y = 0
@@ -37,8 +413,50 @@ class AtomoEditor:
         self.modified = False
         self.message = ""
         self.message_type = "info"
-        self.cut_buffer = ""
-        self.undo_stack: List[Tuple[List[str], int, int]] = []
+        self.cut_buffer: List[str] = []
+        self._cut_chain = False  # True while the last command was Ctrl+K
+        self.undo_stack: List[UndoEntry] = []
+
+        # The line being edited is swapped into self.lines as a GapBuffer;
+        # everything else stays a plain str until it is edited
+        self._gap: Optional[GapBuffer] = None
+        self._gap_y = 0
+        # Line under the cursor, valid while (lines, cursor_y, lines.version) match
+        self._cur_line: Union[str, GapBuffer] = ""
+        self._cur_key: Tuple[Optional[LineRope], int, int] = (None, -1, -1)
+        self._line_count = 0  # len(self.lines), kept in step by every edit that adds/removes lines
+
+        # Buffer joined with "\n" for search, and the offset in it where each
+        # line starts; both dropped on every edit (every edit goes through the undo stack)
+        self._search_text: Optional[str] = None
+        self._line_offsets: List[int] = []
+
+        # Damage-based rendering: draw_* compose into _frame, _flush_frame
+        # sends only the cells that differ from _shadow (what is on screen)
+        self._frame: List[List[Tuple[str, int]]] = []
+        self._shadow: List[Optional[List[Tuple[str, int]]]] = []
+        self._shadow_size = (0, 0)
+        self._drawn_offset = (0, 0)
+        self._dirty_rows: Set[int] = set()
+        self._full_redraw = True
+        self._dirty_regions = REGION_ALL
+        self._touched = False  # a row was written outside the frame since the last draw()
+        self._last_draw = 0.0  # time.monotonic() at the end of the last draw()
+        self._region_inputs: Dict[int, tuple] = {}  # REGION_* bit -> state it was last composed from
+        # Buffer rows are written to a pad the size of the text area and
+        # blitted onto the screen with a single pnoutrefresh per frame
+        self._pad = None
+        self._pad_rows = 0
+        self._cells: Dict[int, CellTable] = {}  # shared cells, so equal rows compare by identity
+        # Cells of buffer lines from column 0, keyed by id(line); the value
+        # keeps the line itself so a recycled id can never produce a false hit
+        self._row_cache: "OrderedDict[int, Tuple[str, List[Tuple[str, int]]]]" = OrderedDict()
+        self._dims: Optional[Tuple[int, int, int, int]] = None
+        self._blank = ""
+        self._cur_attr = 0
+        self._help_text = "  " + "".join(f"{key} {desc}   " for key, desc in HELP_SHORTCUTS)
+        self._help_row: List[Tuple[str, int]] = []  # composed help bar, rebuilt when the width changes
+        self._keymap = self._build_keymap()
 
         curses.start_color()
         curses.use_default_colors()
@@ -49,33 +467,58 @@ class AtomoEditor:
 
         curses.curs_set(1)
         self.stdscr.keypad(True)
+        if hasattr(curses, "set_escdelay"):  # Python 3.9+
+            curses.set_escdelay(ESC_DELAY)  # so Esc cancels a prompt without a second's lag
+        curses.raw()  # ^C and ^Z arrive as keys (cancel, undo) instead of signals
 
         if filename:
             self.load_file(filename)
         else:
-            self.lines = [""]
+            self.lines = LineRope([""])
+            self._line_count = 1
 
     # ------------------------------------------------------------------
     # Undo
     # ------------------------------------------------------------------
 
-    def push_undo(self):
-        """Save current state to undo stack before a destructive operation"""
-        self.undo_stack.append((list(self.lines), self.cursor_y, self.cursor_x))
+    def _push_undo_entry(self, entry: UndoEntry):
+        self._search_text = None
+        self.undo_stack.append(entry)
         if len(self.undo_stack) > MAX_UNDO:
             self.undo_stack.pop(0)
 
+    def push_undo(self):
+        """Save current state to undo stack before a destructive operation"""
+        self.flush_gap()
+        self._push_undo_entry((self.lines.copy(), self.cursor_y, self.cursor_x, None))
+
+    def push_undo_edit(self, y: int, x: int, removed: str, inserted: int):
+        """Record an edit within line y: `removed` was taken out and `inserted` chars put in at x"""
+        self._push_undo_entry((None, self.cursor_y, self.cursor_x, (y, x, removed, inserted)))
+
     def undo(self):
         """Restore the previous state from the undo stack"""
         if not self.undo_stack:
             self.message = "Nothing to undo"
             self.message_type = "info"
             return
-        self.lines, self.cursor_y, self.cursor_x = self.undo_stack.pop()
+        lines, self.cursor_y, self.cursor_x, edit = self.undo_stack.pop()
+        self._search_text = None
+        if edit is None:
+            self._gap = None
+            self.lines = lines
+            self._line_count = len(lines)
+            self._full_redraw = True
+        else:
+            y, x, removed, inserted = edit
+            gap = self.edit_line(y)
+            gap.move_gap(x)
+            gap.delete_right(inserted)
+            gap.insert(removed)
+            self.mark_dirty(y, y + 1)
         self.modified = True
         self.message = "Undo"
         self.message_type = "info"
-        self.adjust_scroll()
 
     # ------------------------------------------------------------------
     # File I/O
@@ -83,25 +526,29 @@ class AtomoEditor:
 
     def load_file(self, filename: str) -> bool:
         """Load a file into the editor"""
+        self._gap = None
+        self._search_text = None
         try:
             if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    self.lines = f.read().splitlines()
-                    if not self.lines:
-                        self.lines = [""]
+                self.lines = LineRope(read_lines(filename))
+                if not self.lines:
+                    self.lines = LineRope([""])
                 self.message = f'Read {len(self.lines)} lines from {filename}'
                 self.message_type = "success"
             else:
-                self.lines = [""]
+                self.lines = LineRope([""])
                 self.message = f'New File: {filename}'
                 self.message_type = "info"
             self.filename = filename
             self.modified = False
+            self._line_count = len(self.lines)
+            self._full_redraw = True
             return True
         except Exception as e:
             self.message = f'Error reading {filename}: {str(e)}'
             self.message_type = "error"
-            self.lines = [""]
+            self.lines = LineRope([""])
+            self._line_count = 1
             return False
 
     def save_file(self, filename: Optional[str] = None) -> bool:
@@ -112,12 +559,17 @@ class AtomoEditor:
         if not self.filename:
             return False
 
+        self.flush_gap()
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.lines) + '\n')
+            with open(self.filename, 'wb', buffering=io_buffer_size(self.filename)) as f:
+                # One encode and write per rope chunk instead of per line
+                write = f.write
+                for block in self.lines.blocks():
+                    write('\n'.join(block).encode('utf-8'))
+                    write(b'\n')
 
             self.modified = False
-            self.message = f'Wrote {len(self.lines)} lines to {self.filename}'
+            self.message = f'Wrote {self._line_count} lines to {self.filename}'
             self.message_type = "success"
             return True
         except Exception as e:
@@ -129,14 +581,22 @@ class AtomoEditor:
     # Drawing
     # ------------------------------------------------------------------
 
+    def _get_dims(self) -> Tuple[int, int, int, int]:
+        """Return (max_y, max_x, height, width), cached until the next KEY_RESIZE"""
+        if self._dims is None:
+            max_y, max_x = self.stdscr.getmaxyx()
+            self._dims = (max_y, max_x, max_y - 4, max_x)
+            self._blank = " " * max_x
+        return self._dims
+
     def get_dimensions(self) -> Tuple[int, int]:
         """Get usable dimensions (excluding status bars)"""
-        max_y, max_x = self.stdscr.getmaxyx()
-        return max_y - 4, max_x
+        _, _, height, width = self._get_dims()
+        return height, width
 
     def safe_addstr(self, y, x, text, attr=0):
         """Safely add string to screen, silently truncating at the right edge"""
-        max_y, max_x = self.stdscr.getmaxyx()
+        max_y, max_x, _, _ = self._get_dims()
         if y >= max_y or x >= max_x:
             return
 
@@ -144,104 +604,285 @@ class AtomoEditor:
         if max_len <= 0:
             return
 
-        text = str(text)[:max_len]
-
         try:
             if attr:
-                self.stdscr.addstr(y, x, text, attr)
+                self.stdscr.addnstr(y, x, str(text), max_len, attr)
             else:
+                self.stdscr.addnstr(y, x, str(text), max_len)
+        except curses.error:
+            pass
+
+    def mark_dirty(self, start: int, stop: Optional[int] = None):
+        """Flag buffer lines [start, stop) for repaint (stop=None: to the bottom of the view)"""
+        if stop is None:
+            height, _ = self.get_dimensions()
+            stop = self.offset_y + height
+        self._dirty_rows.update(range(start, stop))
+
+    def mark_regions(self):
+        """Set the dirty bit of every region whose displayed state changed since it was composed"""
+        for bit, state in ((REGION_TITLE, (self.filename, self.modified)),
+                           (REGION_MESSAGE, (self.message, self.message_type)),
+                           (REGION_STATUS, (self.cursor_y, self.cursor_x, self._line_count))):
+            if self._region_inputs.get(bit) != state:
+                self._region_inputs[bit] = state
+                self._dirty_regions |= bit
+
+    def invalidate_screen(self):
+        """Forget what is on screen so the next draw repaints everything"""
+        self._shadow_size = (0, 0)
+
+    def _touch_row(self, y: int):
+        """Forget the shadow of a row that was written outside the frame"""
+        if 0 <= y < len(self._shadow):
+            self._shadow[y] = None
+            self._touched = True
+
+    def _reset_frame(self, max_y: int, max_x: int):
+        """Start from a cleared screen and a blank frame of the current size"""
+        width = max(0, max_x - 1)
+        self._frame = [[BLANK_CELL] * width for _ in range(max_y)]
+        self._shadow = [None] * max_y
+        self._shadow_size = (max_y, max_x)
+        self._full_redraw = True
+        self._dirty_regions = REGION_ALL
+        self._pad_rows = max(0, max_y - 4)
+        self._pad = curses.newpad(max(1, self._pad_rows), max(1, max_x))
+        self.stdscr.clear()
+
+    def _cell_table(self, attr: int) -> CellTable:
+        """Shared cells for one attribute"""
+        cells = self._cells.get(attr)
+        if cells is None:
+            cells = self._cells[attr] = CellTable(attr)
+        return cells
+
+    def _compose_row(self, width: int, segments: List[Tuple[str, int]], fill: int = 0) -> List[Tuple[str, int]]:
+        """Build a row of cells from (text, attr) runs, padded with blanks to width"""
+        row: List[Tuple[str, int]] = []
+        for text, attr in segments:
+            row.extend(map(self._cell_table(attr).__getitem__, text))
+        if len(row) < width:
+            row.extend([(" ", fill)] * (width - len(row)))
+        return row[:width]
+
+    def _put_row(self, y: int, segments: List[Tuple[str, int]], fill: int = 0):
+        """Compose a whole row into the frame, padded with blanks to the right edge"""
+        if y < len(self._frame):
+            self._frame[y] = self._compose_row(len(self._frame[y]), segments, fill)
+
+    def _buffer_row(self, line: Union[str, GapBuffer], width: int) -> List[Tuple[str, int]]:
+        """Cells for the visible part of a buffer line.
+
+        The cells of unchanged str lines are kept from the start of the line up to
+        ROW_CACHE_COLUMNS, so horizontal scrolling only slices them at the new offset. Lines with tabs,
+        control characters, wide glyphs or combining marks are expanded with
+        display_cells() for the visible part only.
+        """
+        row_width = max(0, width - 1)
+        start, stop = self.offset_x, self.offset_x + row_width
+        if type(line) is not str:
+            # The GapBuffer being edited changes in place, so it is never cached
+            text = line[start:stop]
+            return self._compose_row(row_width, [(text if single_cell_text(text) else display_cells(text), 0)])
+
+        key = id(line)
+        cached = self._row_cache.get(key)
+        if cached is None or cached[0] is not line:
+            # No cell list for lines whose characters are not one cell each
+            cached = self._row_cache[key] = (line, [] if single_cell_text(line) else None)
+            height, _ = self.get_dimensions()
+            while len(self._row_cache) > 2 * height:
+                self._row_cache.popitem(last=False)
+        else:
+            self._row_cache.move_to_end(key)
+
+        cells = cached[1]
+        if cells is None:
+            return self._compose_row(row_width, [(display_cells(line[start:stop]), 0)])
+        if stop > ROW_CACHE_COLUMNS:
+            return self._compose_row(row_width, [(line[start:stop], 0)])
+        if len(cells) < stop and len(cells) < len(line):
+            # Compose a screen ahead, so scrolling right reuses the cells
+            end = min(stop + row_width, ROW_CACHE_COLUMNS)
+            cells.extend(map(self._cell_table(0).__getitem__, line[len(cells):end]))
+        row = cells[start:stop]
+        if len(row) < row_width:
+            row.extend([BLANK_CELL] * (row_width - len(row)))
+        return row
+
+    def _set_attr(self, attr: int):
+        """Switch the window attribute, skipping the call when it is already set"""
+        if attr != self._cur_attr:
+            self.stdscr.attrset(attr)
+            self._cur_attr = attr
+
+    def _emit(self, y: int, x: int, text: str, attr: int):
+        """Write one run of same-attribute cells to the curses window (text rows go to the pad)"""
+        try:
+            if 1 <= y <= self._pad_rows:
+                self._pad.addstr(y - 1, x, text, attr)
+            else:
+                self._set_attr(attr)
                 self.stdscr.addstr(y, x, text)
         except curses.error:
             pass
 
+    def _flush_frame(self) -> bool:
+        """Send rows that differ from the shadow, at most one addstr per attribute run.
+
+        Returns True if anything was written.
+        """
+        changed = False
+        for y, row in enumerate(self._frame):
+            old = self._shadow[y]
+            # Rows that were not recomposed are the very list already on screen
+            if row is old or row == old:
+                continue
+
+            x, n = 0, len(row)
+            while x < n:
+                start, attr = x, row[x][1]
+                while x < n and row[x][1] == attr:
+                    x += 1
+
+                # Trim the cells of this run that are already on screen
+                first, last = start, x
+                if old is not None:
+                    while first < last and row[first] == old[first]:
+                        first += 1
+                    while last > first and row[last - 1] == old[last - 1]:
+                        last -= 1
+                if start < first < last and not row[first][0]:
+                    first -= 1  # an empty filler cell: rewrite the wide glyph it belongs to
+                if first < last:
+                    self._emit(y, first, ''.join(ch for ch, _ in row[first:last]), attr)
+                    changed = True
+
+            self._shadow[y] = row
+        return changed
+
     def draw_title_bar(self):
         """Draw the top title bar"""
-        max_y, max_x = self.stdscr.getmaxyx()
-        title = "  GNU nano clone - Atomo"
+        max_y, max_x, _, _ = self._get_dims()
         filename_display = self.filename if self.filename else "[New Buffer]"
         mod_indicator = " *" if self.modified else ""
+        attr = curses.color_pair(2) | curses.A_BOLD
 
-        self.stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-        self.safe_addstr(0, 0, " " * (max_x - 1))
-        self.safe_addstr(0, 0, title)
-
+        bar = TITLE
         filename_str = f" File: {filename_display}{mod_indicator} "
-        if len(filename_str) < max_x - len(title):
+        if len(filename_str) < max_x - len(TITLE):
             x_pos = (max_x - len(filename_str)) // 2
-            self.safe_addstr(0, x_pos, filename_str)
+            bar = TITLE[:x_pos].ljust(x_pos) + filename_str + TITLE[x_pos + len(filename_str):]
 
-        self.stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
+        self._put_row(0, [(bar, attr)], attr)
 
     def draw_status_bar(self):
         """Draw the bottom status bar"""
-        max_y, max_x = self.stdscr.getmaxyx()
-        status_left = f" Line {self.cursor_y + 1}/{len(self.lines)}  Col {self.cursor_x + 1} "
-
-        self.stdscr.attron(curses.color_pair(1))
-        self.safe_addstr(max_y - 2, 0, " " * (max_x - 1))
-        self.safe_addstr(max_y - 2, 0, status_left)
-        self.stdscr.attroff(curses.color_pair(1))
+        max_y, max_x, _, _ = self._get_dims()
+        status_left = f" Line {self.cursor_y + 1}/{self._line_count}  Col {self.cursor_x + 1} "
+        attr = curses.color_pair(1)
+        self._put_row(max_y - 2, [(status_left, attr)], attr)
 
     def draw_help_bar(self):
         """Draw the bottom help bar with shortcuts"""
-        max_y, max_x = self.stdscr.getmaxyx()
-
-        shortcuts = [
-            ("^X", "Exit"), ("^O", "Save"), ("^W", "Search"),
-            ("^K", "Cut"), ("^U", "Paste"), ("^Z", "Undo"), ("^G", "Help"),
-        ]
-
-        help_text = "  "
-        for key, desc in shortcuts:
-            help_text += f"{key} {desc}   "
-
-        self.stdscr.attron(curses.color_pair(1))
-        self.safe_addstr(max_y - 1, 0, " " * (max_x - 1))
-        self.safe_addstr(max_y - 1, 0, help_text)
-        self.stdscr.attroff(curses.color_pair(1))
+        max_y, max_x, _, _ = self._get_dims()
+        if not 0 <= max_y - 1 < len(self._frame):
+            return
+        width = len(self._frame[max_y - 1])
+        if len(self._help_row) != width:
+            attr = curses.color_pair(1)
+            self._help_row = self._compose_row(width, [(self._help_text, attr)], attr)
+        self._frame[max_y - 1] = self._help_row
 
     def draw_message(self):
-        """Draw message line if there is one"""
+        """Draw message line (blank when there is no message)"""
+        max_y, max_x, _, _ = self._get_dims()
+        segments = []
+
         if self.message:
-            max_y, max_x = self.stdscr.getmaxyx()
             color = curses.color_pair(3) if self.message_type == "error" else \
                     curses.color_pair(4) if self.message_type == "success" else 0
+            segments.append((f" {self.message}", color | curses.A_BOLD))
 
-            self.safe_addstr(max_y - 3, 0, " " * (max_x - 1))
-            self.stdscr.attron(color | curses.A_BOLD)
-            self.safe_addstr(max_y - 3, 0, f" {self.message}")
-            self.stdscr.attroff(color | curses.A_BOLD)
+        self._put_row(max_y - 3, segments)
+
+    def viewport(self) -> List[Union[str, GapBuffer]]:
+        """Lines currently on screen; rendering never looks past this slice"""
+        height, _ = self.get_dimensions()
+        return self.lines[self.offset_y:self.offset_y + height]
 
     def draw_buffer(self):
-        """Draw the text buffer"""
+        """Draw the text buffer, recomposing only rows that changed since the last frame"""
         height, width = self.get_dimensions()
+        offset = (self.offset_y, self.offset_x)
+        redraw_all = self._full_redraw or offset != self._drawn_offset
+        if not redraw_all and not self._dirty_rows:
+            return
+        view = self.viewport()
 
         for screen_y in range(height):
-            buffer_y = screen_y + self.offset_y
-            self.safe_addstr(screen_y + 1, 0, " " * width)
+            if not redraw_all and screen_y + self.offset_y not in self._dirty_rows:
+                continue
 
-            if buffer_y < len(self.lines):
-                line = self.lines[buffer_y]
-                visible_line = line[self.offset_x:self.offset_x + width]
-                self.safe_addstr(screen_y + 1, 0, visible_line)
+            if screen_y < len(view):
+                self._frame[screen_y + 1] = self._buffer_row(view[screen_y], width)
+            else:
+                self._put_row(screen_y + 1, [])
+
+        self._dirty_rows.clear()
+        self._full_redraw = False
+        self._drawn_offset = offset
 
     def draw(self):
-        """Draw the entire interface"""
-        self.stdscr.clear()
-        self.draw_title_bar()
+        """Draw the entire interface, sending only what changed to the terminal"""
+        max_y, max_x, _, _ = self._get_dims()
+        if (max_y, max_x) != self._shadow_size:
+            self._reset_frame(max_y, max_x)
+        # Key handlers only move the cursor; the view follows it once per frame
+        self.adjust_scroll()
+
+        self.mark_regions()
+        if not (self._dirty_regions or self._dirty_rows or self._full_redraw or self._touched) \
+                and (self.offset_y, self.offset_x) == self._drawn_offset:
+            return  # the key changed nothing on screen, e.g. Right at the end of the buffer
+        regions = self._dirty_regions
+        if regions & REGION_TITLE:
+            self.draw_title_bar()
         self.draw_buffer()
-        self.draw_message()
-        self.draw_status_bar()
-        self.draw_help_bar()
+        if regions & REGION_MESSAGE:
+            self.draw_message()
+        if regions & REGION_STATUS:
+            self.draw_status_bar()
+        if regions & REGION_HELP:
+            self.draw_help_bar()
+        self._dirty_regions = 0
+        changed = self._flush_frame()
+        self._touched = False
+        self._set_attr(0)
 
         screen_y = self.cursor_y - self.offset_y + 1
-        screen_x = self.cursor_x - self.offset_x
+        screen_x = self.cursor_column()
         height, width = self.get_dimensions()
 
+        self.stdscr.noutrefresh()
+        if self._pad_rows and max_x > 1:
+            self._pad.noutrefresh(0, 0, 1, 0, self._pad_rows, max_x - 2)
         if 0 <= screen_y < height + 1 and 0 <= screen_x < width:
-            self.stdscr.move(screen_y, screen_x)
-
-        self.stdscr.refresh()
+            curses.setsyx(screen_y, screen_x)
+        if changed:
+            self._write_terminal(BEGIN_SYNC_UPDATE)
+        curses.doupdate()
+        if changed:
+            self._write_terminal(END_SYNC_UPDATE)
+        self._last_draw = time.monotonic()
+
+    def _write_terminal(self, data: bytes):
+        """Send raw bytes to the terminal; curses has flushed its own output after doupdate()"""
+        try:
+            os.write(sys.stdout.fileno(), data)
+        except (OSError, ValueError):
+            pass
 
     # ------------------------------------------------------------------
     # Scrolling and cursor movement
@@ -260,65 +901,112 @@ class AtomoEditor:
             self.offset_x = self.cursor_x
         elif self.cursor_x >= self.offset_x + width:
             self.offset_x = self.cursor_x - width + 1
+        # Tabs and wide glyphs take more columns than characters
+        while self.offset_x < self.cursor_x and self.cursor_column() >= width:
+            self.offset_x += 1
+
+    def cursor_column(self) -> int:
+        """Screen column of the cursor within the text area"""
+        text = self.current_line()[self.offset_x:self.cursor_x]
+        return len(text) if single_cell_text(text) else len(display_cells(text))
+
+    def current_line(self) -> Union[str, GapBuffer]:
+        """The line under the cursor, looked up again only after cursor_y or the buffer changes"""
+        key = (self.lines, self.cursor_y, self.lines.version)
+        if key != self._cur_key:
+            self._cur_line = self.lines[self.cursor_y]
+            self._cur_key = key
+        return self._cur_line
 
     def move_cursor(self, dy: int, dx: int):
         """Move cursor with bounds checking"""
         self.message = ""
 
-        self.cursor_y = max(0, min(len(self.lines) - 1, self.cursor_y + dy))
-
-        current_line = self.lines[self.cursor_y]
-        self.cursor_x = max(0, min(len(current_line), self.cursor_x + dx))
-
-        self.adjust_scroll()
+        self.cursor_y = max(0, min(self._line_count - 1, self.cursor_y + dy))
+        self.cursor_x = max(0, min(len(self.current_line()), self.cursor_x + dx))
 
     # ------------------------------------------------------------------
     # Editing operations
     # ------------------------------------------------------------------
 
+    def edit_line(self, y: int) -> GapBuffer:
+        """Return line y as a GapBuffer, flushing the line that held the gap before"""
+        if self._gap is None or self._gap_y != y:
+            self.flush_gap()
+            self._gap = GapBuffer(self.lines[y])
+            self._gap_y = y
+            self.lines[y] = self._gap
+        return self._gap
+
+    def flush_gap(self):
+        """Turn the line being edited back into a plain str (before whole-buffer operations)"""
+        if self._gap is not None:
+            self.lines[self._gap_y] = str(self._gap)
+            self._gap = None
+
+    def clamp_cursor_x(self):
+        """Keep cursor_x within the current line, so the gap and the undo entry agree on it"""
+        length = len(self.current_line())
+        if self.cursor_x > length:
+            self.cursor_x = length
+
     def insert_char(self, char: str):
         """Insert text at cursor position"""
-        self.push_undo()
-        line = self.lines[self.cursor_y]
-        self.lines[self.cursor_y] = line[:self.cursor_x] + char + line[self.cursor_x:]
+        self.clamp_cursor_x()
+        self.push_undo_edit(self.cursor_y, self.cursor_x, "", len(char))
+        gap = self.edit_line(self.cursor_y)
+        gap.move_gap(self.cursor_x)
+        gap.insert(char)
+        self.mark_dirty(self.cursor_y, self.cursor_y + 1)
         self.cursor_x += len(char)  # FIX: was += 1, which broke Tab (4 spaces → cursor off by 3)
         self.modified = True
         self.message = ""
-        self.adjust_scroll()
 
     def delete_char(self):
         """Delete character at cursor (Delete key)"""
-        self.push_undo()
-        line = self.lines[self.cursor_y]
-
-        if self.cursor_x < len(line):
-            self.lines[self.cursor_y] = line[:self.cursor_x] + line[self.cursor_x + 1:]
-            self.modified = True
-        elif self.cursor_y < len(self.lines) - 1:
-            self.lines[self.cursor_y] = line + self.lines[self.cursor_y + 1]
-            self.lines.pop(self.cursor_y + 1)
+        self.clamp_cursor_x()
+        if self.cursor_x < len(self.current_line()):
+            gap = self.edit_line(self.cursor_y)
+            gap.move_gap(self.cursor_x)
+            removed = gap.delete_right()
+            self.push_undo_edit(self.cursor_y, self.cursor_x, removed, 0)
+            self.mark_dirty(self.cursor_y, self.cursor_y + 1)
             self.modified = True
+        else:
+            self.push_undo()
+            if self.cursor_y < self._line_count - 1:
+                self.lines[self.cursor_y] += self.lines[self.cursor_y + 1]
+                self.lines.pop(self.cursor_y + 1)
+                self._line_count -= 1
+                self.mark_dirty(self.cursor_y)
+                self.modified = True
 
         self.message = ""
 
     def backspace(self):
         """Delete character before cursor (Backspace key)"""
-        self.push_undo()
+        self.clamp_cursor_x()
         if self.cursor_x > 0:
-            line = self.lines[self.cursor_y]
-            self.lines[self.cursor_y] = line[:self.cursor_x - 1] + line[self.cursor_x:]
+            gap = self.edit_line(self.cursor_y)
+            gap.move_gap(self.cursor_x)
+            removed = gap.delete_left()
+            self.push_undo_edit(self.cursor_y, self.cursor_x - 1, removed, 0)
+            self.mark_dirty(self.cursor_y, self.cursor_y + 1)
             self.cursor_x -= 1
             self.modified = True
-        elif self.cursor_y > 0:
-            prev_line_len = len(self.lines[self.cursor_y - 1])
-            self.lines[self.cursor_y - 1] += self.lines[self.cursor_y]
-            self.lines.pop(self.cursor_y)
-            self.cursor_y -= 1
-            self.cursor_x = prev_line_len
-            self.modified = True
+        else:
+            self.push_undo()
+            if self.cursor_y > 0:
+                prev_line_len = len(self.lines[self.cursor_y - 1])
+                self.lines[self.cursor_y - 1] += self.lines[self.cursor_y]
+                self.lines.pop(self.cursor_y)
+                self._line_count -= 1
+                self.mark_dirty(self.cursor_y - 1)
+                self.cursor_y -= 1
+                self.cursor_x = prev_line_len
+                self.modified = True
 
         self.message = ""
-        self.adjust_scroll()
 
     def insert_newline(self):
         """Insert a new line at cursor position"""
@@ -326,35 +1014,60 @@ class AtomoEditor:
         line = self.lines[self.cursor_y]
         self.lines[self.cursor_y] = line[:self.cursor_x]
         self.lines.insert(self.cursor_y + 1, line[self.cursor_x:])
+        self._line_count += 1
+        self.mark_dirty(self.cursor_y)
         self.cursor_y += 1
         self.cursor_x = 0
         self.modified = True
         self.message = ""
-        self.adjust_scroll()
 
     # ------------------------------------------------------------------
     # Prompts
     # ------------------------------------------------------------------
 
-    def prompt_input(self, prompt_text: str, default: str = "") -> str:
-        """Render an inline prompt at the message line and return user input"""
-        max_y, max_x = self.stdscr.getmaxyx()
+    def _draw_prompt_line(self, prompt_text: str):
+        """Write the highlighted prompt over the message line in a single addstr"""
+        max_y, max_x, _, _ = self._get_dims()
+        self._set_attr(curses.color_pair(1))
+        self.safe_addstr(max_y - 3, 0, prompt_text + self._blank[len(prompt_text):max_x - 1])
+        self._set_attr(0)
+        self._touch_row(max_y - 3)
+        try:
+            self.stdscr.move(max_y - 3, min(len(prompt_text), max_x - 2))
+        except curses.error:
+            pass
 
-        self.stdscr.attron(curses.color_pair(1))
-        self.safe_addstr(max_y - 3, 0, " " * (max_x - 1))
-        self.safe_addstr(max_y - 3, 0, prompt_text)
-        self.stdscr.attroff(curses.color_pair(1))
+    def _modal_input(self, prompt_text: str) -> Optional[str]:
+        """Read a line of input on the prompt row; return None if cancelled with Esc/^C"""
+        buf = bytearray()
+        while True:
+            _, max_x, _, _ = self._get_dims()
+            text = buf.decode('utf-8', 'ignore')
+            room = max(0, max_x - 2 - len(prompt_text))
+            self._draw_prompt_line(prompt_text + (text[-room:] if room else ""))
+            self.stdscr.refresh()
 
-        self.stdscr.refresh()
-        curses.echo()
-        try:
-            col = min(len(prompt_text), max_x - 2)
-            self.stdscr.move(max_y - 3, col)
-            raw = self.stdscr.getstr(max_y - 3, col, max(1, max_x - len(prompt_text) - 1))
-            input_str = raw.decode('utf-8')
-        except Exception:
-            input_str = ""
-        curses.noecho()
+            key = self.stdscr.getch()
+            if key in ENTER_KEYS:
+                return buf.decode('utf-8', 'replace')
+            elif key in CANCEL_KEYS:
+                return None
+            elif key in BACKSPACE_KEYS:
+                # Drop a whole UTF-8 sequence, not just its last byte
+                while buf and buf[-1] & 0xC0 == 0x80:
+                    buf.pop()
+                if buf:
+                    buf.pop()
+            elif key == curses.KEY_RESIZE:
+                self._dims = None
+            elif 32 <= key <= 255:
+                buf.append(key)
+
+    def prompt_input(self, prompt_text: str, default: str = "") -> str:
+        """Render an inline prompt at the message line and return user input"""
+        input_str = self._modal_input(prompt_text)
+        if input_str is None:
+            return ""
 
         input_str = ''.join(c for c in input_str if c.isprintable()).strip()
         return input_str if input_str else default
@@ -378,39 +1091,25 @@ class AtomoEditor:
         if not query:
             return
 
-        start_y = self.cursor_y
-        start_x = self.cursor_x + 1
-
-        pos = self.lines[start_y][start_x:].find(query)
-        if pos != -1:
-            self.cursor_x = start_x + pos
-            self.message = f"Found '{query}'"
-            self.message_type = "success"
-            self.adjust_scroll()
+        if self._search_text is None:
+            self.flush_gap()
+            self._search_text = "\n".join(self.lines)
+            self._line_offsets = list(accumulate((len(line) + 1 for line in self.lines), initial=0))
+
+        text, offsets = self._search_text, self._line_offsets
+        hit = text.find(query, offsets[self.cursor_y] + self.cursor_x + 1)
+        wrapped = hit < 0
+        if wrapped:
+            hit = text.find(query)
+        if hit < 0:
+            self.message = f"'{query}' not found"
+            self.message_type = "error"
             return
 
-        for y in range(start_y + 1, len(self.lines)):
-            pos = self.lines[y].find(query)
-            if pos != -1:
-                self.cursor_y = y
-                self.cursor_x = pos
-                self.message = f"Found '{query}'"
-                self.message_type = "success"
-                self.adjust_scroll()
-                return
-
-        for y in range(0, start_y):
-            pos = self.lines[y].find(query)
-            if pos != -1:
-                self.cursor_y = y
-                self.cursor_x = pos
-                self.message = f"Found '{query}' (wrapped)"
-                self.message_type = "success"
-                self.adjust_scroll()
-                return
-
-        self.message = f"'{query}' not found"
-        self.message_type = "error"
+        y = bisect.bisect_right(offsets, hit) - 1
+        self.cursor_y, self.cursor_x = y, hit - offsets[y]
+        self.message = f"Found '{query}' (wrapped)" if wrapped else f"Found '{query}'"
+        self.message_type = "success"
 
     # ------------------------------------------------------------------
     # Help and exit
@@ -418,7 +1117,7 @@ class AtomoEditor:
 
     def show_help(self):
         """Show help screen"""
-        max_y, max_x = self.stdscr.getmaxyx()
+        max_y, max_x, _, _ = self._get_dims()
         help_text = [
             "Atomo Help - A nano clone",
             "",
@@ -426,8 +1125,8 @@ class AtomoEditor:
             "  Ctrl+X  Exit (prompts to save if modified)",
             "  Ctrl+O  Save file (Write Out)",
             "  Ctrl+W  Search (Where Is)",
-            "  Ctrl+K  Cut line",
-            "  Ctrl+U  Paste line",
+            "  Ctrl+K  Cut line (repeat to cut several)",
+            "  Ctrl+U  Paste cut lines",
             "  Ctrl+Z  Undo (up to 200 steps)",
             "  Ctrl+G  Show this help",
             "",
@@ -453,19 +1152,17 @@ class AtomoEditor:
 
         self.stdscr.refresh()
         self.stdscr.getch()
+        self._dims = None
+        self.invalidate_screen()
 
     def confirm_exit(self) -> bool:
         """Ask user to confirm exit if buffer is modified"""
         if not self.modified:
             return True
 
-        max_y, max_x = self.stdscr.getmaxyx()
         prompt = "Save modified buffer? (Y/N/C for cancel) "
 
-        self.stdscr.attron(curses.color_pair(1))
-        self.safe_addstr(max_y - 3, 0, " " * (max_x - 1))
-        self.safe_addstr(max_y - 3, 0, prompt)
-        self.stdscr.attroff(curses.color_pair(1))
+        self._draw_prompt_line(prompt)
         self.stdscr.refresh()
 
         while True:
@@ -477,114 +1174,242 @@ class AtomoEditor:
                 return False
             elif key in [ord('n'), ord('N'), CTRL_X]:  # Ctrl+X due volte = esci senza salvare
                 return True
-            elif key in [ord('c'), ord('C'), 27]:  # 27 = ESC
+            elif key in CANCEL_KEYS or key in [ord('c'), ord('C')]:
                 return False
+            elif key == curses.KEY_RESIZE:
+                self._dims = None
+                self._draw_prompt_line(prompt)
+                self.stdscr.refresh()
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def _build_keymap(self) -> Dict[int, Callable[[], Optional[bool]]]:
+        """Map key codes to command handlers; a handler returning False exits the editor"""
+        keymap: Dict[int, Callable[[], Optional[bool]]] = {
+            CTRL_X: self._cmd_exit,
+            CTRL_O: self._cmd_save,
+            CTRL_W: self._cmd_search,
+            CTRL_K: self._cmd_cut,
+            CTRL_U: self._cmd_paste,
+            CTRL_Z: self.undo,
+            CTRL_G: self.show_help,
+            curses.KEY_RESIZE: self._cmd_resize,
+            CTRL_A: self._cmd_home,
+            CTRL_E: self._cmd_end,
+            curses.KEY_HOME: self._cmd_home,
+            curses.KEY_END: self._cmd_end,
+            curses.KEY_UP: lambda: self.move_cursor(-1, 0),
+            curses.KEY_DOWN: lambda: self.move_cursor(1, 0),
+            curses.KEY_LEFT: self._cmd_left,
+            curses.KEY_RIGHT: self._cmd_right,
+            curses.KEY_PPAGE: self._cmd_page_up,
+            curses.KEY_NPAGE: self._cmd_page_down,
+            curses.KEY_DC: self.delete_char,
+            TAB: lambda: self.insert_char('    '),
+        }
+        for key in ENTER_KEYS:
+            keymap[key] = self.insert_newline
+        for key in BACKSPACE_KEYS:
+            keymap[key] = self.backspace
+        return keymap
+
+    def _cmd_exit(self) -> bool:
+        """Ctrl+X: exit, asking to save a modified buffer first"""
+        return not self.confirm_exit()
+
+    def _cmd_save(self):
+        """Ctrl+O: write the buffer out under a prompted filename"""
+        filename = self.prompt_save_filename()
+        if filename:
+            self.save_file(filename)
+
+    def _cmd_search(self):
+        """Ctrl+W: prompt for a query and jump to the next match"""
+        query = self.prompt_search()
+        if query:
+            self.search(query)
+
+    def _cmd_cut(self):
+        """Ctrl+K: cut the current line; consecutive cuts add to the cut buffer like nano"""
+        if self.lines:
+            self.push_undo()
+            if not self._cut_chain:
+                self.cut_buffer = []
+            self.cut_buffer.append(self.lines.pop(self.cursor_y))
+            self._cut_chain = True
+            self.mark_dirty(self.cursor_y)
+            if not self.lines:
+                self.lines = LineRope([""])
+            self._line_count = len(self.lines)
+            if self.cursor_y >= self._line_count:
+                self.cursor_y = self._line_count - 1
+            self.cursor_x = 0
+            self.modified = True
+            self.message = "Cut line"
+            self.message_type = "info"
+
+    def _cmd_paste(self):
+        """Ctrl+U: paste the cut buffer above the current line"""
+        if self.cut_buffer:
+            self.push_undo()
+            self.lines.insert_lines(self.cursor_y, self.cut_buffer)
+            self._line_count = len(self.lines)
+            self.clamp_cursor_x()
+            self.mark_dirty(self.cursor_y)
+            self.modified = True
+            count = len(self.cut_buffer)
+            self.message = "Pasted line" if count == 1 else f"Pasted {count} lines"
+            self.message_type = "info"
+
+    def _cmd_resize(self):
+        """KEY_RESIZE: re-read the terminal size on the next draw"""
+        self._dims = None
+
+    def _cmd_home(self):
+        """Home/Ctrl+A: go to the beginning of the line"""
+        self.cursor_x = 0
+
+    def _cmd_end(self):
+        """End/Ctrl+E: go to the end of the line"""
+        self.cursor_x = len(self.current_line())
+
+    def _cmd_left(self):
+        """Left arrow, wrapping to the end of the previous line"""
+        if self.cursor_x > 0:
+            self.move_cursor(0, -1)
+        elif self.cursor_y > 0:
+            self.cursor_y -= 1
+            self.cursor_x = len(self.current_line())
+
+    def _cmd_right(self):
+        """Right arrow, wrapping to the start of the next line"""
+        if self.cursor_x < len(self.current_line()):
+            self.move_cursor(0, 1)
+        elif self.cursor_y < self._line_count - 1:
+            self.cursor_y += 1
+            self.cursor_x = 0
+
+    def _cmd_page_up(self):
+        """Page Up: move the cursor up one screen"""
+        height, _ = self.get_dimensions()
+        self.move_cursor(-height, 0)
+
+    def _cmd_page_down(self):
+        """Page Down: move the cursor down one screen"""
+        height, _ = self.get_dimensions()
+        self.move_cursor(height, 0)
 
     # ------------------------------------------------------------------
     # Main loop
     # ------------------------------------------------------------------
 
     def run(self):
-        """Main editor loop"""
+        """Main editor loop, drawing once per burst of queued keys"""
+        getch, draw, handle_key = self.stdscr.getch, self.draw, self.handle_key
+        self.stdscr.timeout(-1)  # getch() blocks while idle; only drain_input() polls
         while True:
-            self.draw()
-            key = self.stdscr.getch()
-
-            if key == CTRL_X:
-                if self.confirm_exit():
+            draw()
+            if not handle_key(getch()):
+                break
+            self.drain_input()
+
+    def drain_input(self):
+        """Handle keys already queued (paste, key repeat) without drawing in between.
+
+        Once the queue is empty, keep collecting keys until FRAME_INTERVAL has
+        passed since the last frame, so redraws never exceed 60 per second.
+        Runs of printable keys (a paste) are inserted with a single insert_char.
+        """
+        deadline = time.monotonic() + FRAME_BUDGET
+        next_frame = self._last_draw + FRAME_INTERVAL
+        batch: List[str] = []
+        stdscr = self.stdscr
+        getch, monotonic = stdscr.getch, time.monotonic
+        stdscr.nodelay(True)
+        try:
+            while True:
+                now = monotonic()
+                if now >= deadline:
                     break
-
-            elif key == CTRL_O:
-                filename = self.prompt_save_filename()
-                if filename:
-                    self.save_file(filename)
-
-            elif key == CTRL_W:
-                query = self.prompt_search()
-                if query:
-                    self.search(query)
-
-            elif key == CTRL_K:
-                if self.lines:
-                    self.push_undo()
-                    self.cut_buffer = self.lines[self.cursor_y]
-                    self.lines.pop(self.cursor_y)
-                    if not self.lines:
-                        self.lines = [""]
-                    if self.cursor_y >= len(self.lines):
-                        self.cursor_y = len(self.lines) - 1
-                    self.cursor_x = 0
-                    self.modified = True
-                    self.message = "Cut line"
-                    self.message_type = "info"
-
-            elif key == CTRL_U:
-                if self.cut_buffer:
-                    self.push_undo()
-                    self.lines.insert(self.cursor_y, self.cut_buffer)
-                    self.modified = True
-                    self.message = "Pasted line"
-                    self.message_type = "info"
-
-            elif key == CTRL_Z:
-                self.undo()
-
-            elif key == CTRL_G:
-                self.show_help()
-
-            elif key == CTRL_A:
-                self.cursor_x = 0
-                self.adjust_scroll()
-
-            elif key == CTRL_E:
-                self.cursor_x = len(self.lines[self.cursor_y])
-                self.adjust_scroll()
-
-            elif key == curses.KEY_UP:
-                self.move_cursor(-1, 0)
-            elif key == curses.KEY_DOWN:
-                self.move_cursor(1, 0)
-            elif key == curses.KEY_LEFT:
-                if self.cursor_x > 0:
-                    self.move_cursor(0, -1)
-                elif self.cursor_y > 0:
-                    self.cursor_y -= 1
-                    self.cursor_x = len(self.lines[self.cursor_y])
-                    self.adjust_scroll()
-            elif key == curses.KEY_RIGHT:
-                if self.cursor_x < len(self.lines[self.cursor_y]):
-                    self.move_cursor(0, 1)
-                elif self.cursor_y < len(self.lines) - 1:
-                    self.cursor_y += 1
-                    self.cursor_x = 0
-                    self.adjust_scroll()
-            elif key == curses.KEY_HOME:
-                self.cursor_x = 0
-                self.adjust_scroll()
-            elif key == curses.KEY_END:
-                self.cursor_x = len(self.lines[self.cursor_y])
-                self.adjust_scroll()
-            elif key == curses.KEY_PPAGE:
-                height, _ = self.get_dimensions()
-                self.move_cursor(-height, 0)
-            elif key == curses.KEY_NPAGE:
-                height, _ = self.get_dimensions()
-                self.move_cursor(height, 0)
-
-            elif key in [curses.KEY_ENTER, 10, 13]:
-                self.insert_newline()
-
-            elif key in [curses.KEY_BACKSPACE, 127, 8]:
-                self.backspace()
-
-            elif key == curses.KEY_DC:
-                self.delete_char()
-
-            elif key == 9:  # Tab
-                self.insert_char('    ')
-
-            elif 32 <= key <= 126:
-                self.insert_char(chr(key))
+                key = getch()
+                if key == -1 and now < next_frame:
+                    stdscr.timeout(max(1, int((next_frame - now) * 1000)))
+                    key = getch()
+                    stdscr.nodelay(True)
+                if key == -1:
+                    break
+                if key in PRINTABLE_KEYS:
+                    self._cut_chain = False
+                    batch.append(chr(key))
+                    continue
+                if 0xC2 <= key <= 0xF4:
+                    char = self._typed_char(key)
+                    stdscr.nodelay(True)  # reading the sequence left the window blocking
+                    if char:
+                        self._cut_chain = False
+                        batch.append(char)
+                    continue
+                if batch:
+                    self.insert_char("".join(batch))
+                    batch.clear()
+                if key in MODAL_KEYS:
+                    # Prompts need an up-to-date screen and blocking input:
+                    # hand the key back to run() so it is read after a draw
+                    curses.ungetch(key)
+                    break
+                self.handle_key(key)
+        finally:
+            stdscr.nodelay(False)
+        if batch:
+            self.insert_char("".join(batch))
+
+    def handle_key(self, key: int) -> bool:
+        """Apply one key press; return False when the editor should exit"""
+        if key != CTRL_K:
+            self._cut_chain = False
+        handler = self._keymap.get(key)
+        if handler is not None:
+            return handler() is not False
+        if key in PRINTABLE_KEYS:
+            self.insert_char(chr(key))
+        elif 0xC2 <= key <= 0xF4:
+            char = self._typed_char(key)
+            if char:
+                self.insert_char(char)
+        return True
+
+    def _typed_char(self, lead: int) -> str:
+        """Read the character started by UTF-8 byte `lead`; "" if it cannot be inserted"""
+        char = self._read_utf8(lead)
+        # Skip control characters; display_cells() lays out wide glyphs and combining marks
+        if char and unicodedata.category(char)[0] != "C":
+            return char
+        return ""
+
+    def _read_utf8(self, lead: int) -> str:
+        """Read the continuation bytes of a UTF-8 sequence started by `lead`; "" if malformed.
+
+        Each byte is waited for up to UTF8_TIMEOUT ms, also when called in nodelay
+        mode; the window is left in blocking mode.
+        """
+        data = bytearray([lead])
+        self.stdscr.timeout(UTF8_TIMEOUT)
+        try:
+            for _ in range(1 if lead < 0xE0 else 2 if lead < 0xF0 else 3):
+                byte = self.stdscr.getch()
+                if not 0x80 <= byte <= 0xBF:
+                    if byte != -1:
+                        curses.ungetch(byte)  # not part of the sequence: keep it as the next key
+                    return ""
+                data.append(byte)
+        finally:
+            self.stdscr.timeout(-1)
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return ""
 
 
 def main(stdscr, filename: Optional[str] = None):